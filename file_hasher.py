@@ -1,37 +1,116 @@
 import hashlib
+import mmap
 import os
-import json
+import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Files up to this size are memory-mapped and hashed in a single update call
+MMAP_LIMIT = 2 * 1024 ** 3
+# Read size when mmap is not used; large enough to amortise per-call overhead
+CHUNK_SIZE = 4 * 1024 * 1024
+
+def hash_file(file_path, algorithm):
+    """Compute the hash of a single file."""
+    if algorithm == "blake3":
+        hasher = blake3.blake3()
+    else:
+        hasher = hashlib.new(algorithm)
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        mm = None
+        if 0 < size <= MMAP_LIMIT:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mm = None
+
+        if mm is not None:
+            with mm:
+                hasher.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _hash_with_stat(file_path, algorithm):
+    """Return (hash, mtime_ns, size) for a file, taking the stat before reading it."""
+    st = os.stat(file_path)
+    return hash_file(file_path, algorithm), st.st_mtime_ns, st.st_size
+
 
 class FileHasher:
-    def __init__(self, file_path, algorithm="sha256", storage_file="hash_store.json"):
+    def __init__(self, file_path, algorithm="blake3", storage_file="hash_store.db"):
         self.file_path = file_path
+        # Fall back to SHA-256 (OpenSSL, SHA-NI where available) without blake3
+        if algorithm == "blake3" and blake3 is None:
+            algorithm = "sha256"
         self.algorithm = algorithm
         self.storage_file = storage_file
-        self.hashes = self._load_hashes()
+        self.conn = None  # Opened on first use by _connection()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the hash store connection if one was opened."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
     def compute_hash(self):
         """Compute the hash of the hardcoded file."""
-        if not os.path.isfile(self.file_path):
-            raise FileNotFoundError(f"File not found: {self.file_path}")
+        return self._stat_and_hash(self.file_path)[0]
 
-        hasher = hashlib.new(self.algorithm)
-        with open(self.file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+    @classmethod
+    def hash_many(cls, paths, algorithm="blake3", workers=None, storage_file="hash_store.db"):
+        """Hash many files in parallel and save all results in one transaction."""
+        # Each file is hashed and saved once, however often it is listed
+        paths = list(dict.fromkeys(paths))
+        with cls(None, algorithm, storage_file) as store:
+            results = {}
+            to_hash = []
+            for path in paths:
+                st = os.stat(path)
+                cached = store._load_unchanged_hash(path, st)
+                if cached is None:
+                    to_hash.append(path)
+                else:
+                    results[path] = cached
+
+            rows = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_hash_with_stat, path, store.algorithm): path for path in to_hash}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    file_hash, mtime_ns, size = future.result()
+                    results[path] = file_hash
+                    rows.append((path, file_hash, mtime_ns, size))
+            store._save_hashes(rows)
+        print(f"Saved {len(rows)} new hashes to {storage_file} "
+              f"({len(results) - len(rows)} unchanged files reused their stored hash)")
+        return results
 
     def save_hash(self):
         """Save the computed hash to storage."""
-        file_hash = self.compute_hash()
-        self.hashes[self.file_path] = file_hash
-        self._save_hashes()
+        file_hash, mtime_ns, size = self._stat_and_hash(self.file_path)
+        self._save_hashes([(self.file_path, file_hash, mtime_ns, size)])
         print(f"Hash saved: {file_hash}")
 
     def compare_hash(self):
         """Compare current file hash with stored hash."""
         current_hash = self.compute_hash()
-        stored_hash = self.hashes.get(self.file_path)
+        stored_hash = self._load_hash(self.file_path)
         if stored_hash:
             if current_hash == stored_hash:
                 print("✅ Hash matches the stored hash.")
@@ -39,31 +118,84 @@ class FileHasher:
                 print("❌ Hash does NOT match the stored hash.")
         else:
             print("No stored hash found for this file.")
+            # Earlier versions kept hashes in a JSON file next to the store
+            legacy_store = os.path.splitext(self.storage_file)[0] + ".json"
+            if os.path.exists(legacy_store):
+                print(f"Note: {legacy_store} from an older version is no longer read; "
+                      "run 'save' again to store this file's hash.")
+
+    def _connection(self, create=True):
+        """Return the store connection, opening it on first use.
 
-    def _save_hashes(self):
-        with open(self.storage_file, "w") as f:
-            json.dump(self.hashes, f)
+        With create=False, returns None instead of creating a store that does
+        not exist yet, so lookups alone never write a database file.
+        """
+        if self.conn is None:
+            if not create and not os.path.exists(self.storage_file):
+                return None
+            self.conn = sqlite3.connect(self.storage_file)
+            # WAL lets readers and concurrent writers share the store
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "path TEXT PRIMARY KEY, algo TEXT NOT NULL, hash TEXT NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+        return self.conn
 
-    def _load_hashes(self):
-        if os.path.exists(self.storage_file):
-            with open(self.storage_file, "r") as f:
-                return json.load(f)
-        return {}
+    def _stat_and_hash(self, path):
+        """Return (hash, mtime_ns, size), reusing the stored hash if the file is unchanged."""
+        st = os.stat(path)
+        cached = self._load_unchanged_hash(path, st)
+        if cached is not None:
+            return cached, st.st_mtime_ns, st.st_size
+        return hash_file(path, self.algorithm), st.st_mtime_ns, st.st_size
+
+    def _save_hashes(self, rows):
+        """Upsert (path, hash, mtime_ns, size) rows in a single transaction."""
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO hashes (path, algo, hash, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+                [(path, self.algorithm, file_hash, mtime_ns, size) for path, file_hash, mtime_ns, size in rows],
+            )
+
+    def _load_unchanged_hash(self, path, st):
+        """Return the stored hash for path if its mtime and size still match st."""
+        conn = self._connection(create=False)
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT hash FROM hashes WHERE path = ? AND algo = ? AND mtime_ns = ? AND size = ?",
+            (path, self.algorithm, st.st_mtime_ns, st.st_size),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _load_hash(self, path):
+        """Return the stored hash for path, or None if it was stored with another algorithm."""
+        conn = self._connection(create=False)
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT hash FROM hashes WHERE path = ? AND algo = ?", (path, self.algorithm)
+        ).fetchone()
+        return row[0] if row else None
 
 if __name__ == "__main__":
     # Hardcoded file path
     FILE_PATH = "1999_3312.txt"  # Change this to your file
-    hasher = FileHasher(FILE_PATH)
-
-    # Check command-line arguments
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
-        if command == "save":
-            hasher.save_hash()
-        elif command == "compare":
-            hasher.compare_hash()
+    with FileHasher(FILE_PATH) as hasher:
+        # Check command-line arguments
+        if len(sys.argv) > 1:
+            command = sys.argv[1].lower()
+            if command == "save":
+                hasher.save_hash()
+            elif command == "compare":
+                hasher.compare_hash()
+            elif command == "save-many":
+                FileHasher.hash_many(sys.argv[2:])
+            else:
+                print("Unknown command. Use 'save', 'compare' or 'save-many'.")
         else:
-            print("Unknown command. Use 'save' or 'compare'.")
-    else:
-        # No param: just print the hash
-        print(f"Computed hash: {hasher.compute_hash()}")
\ No newline at end of file
+            # No param: just print the hash
+            print(f"Computed hash: {hasher.compute_hash()}")
\ No newline at end of file
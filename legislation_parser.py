@@ -3,7 +3,8 @@
 Legislation Parser - Flexible XML Chunking for UK Legislation
 
 This script provides multiple chunking strategies for parsing large UK legislation XML files
-from legislation.gov.uk. It uses streaming parsing to handle large files efficiently.
+from legislation.gov.uk. The file is parsed once and the tree reused across strategies, or
+streamed with iterparse (stream=True / --stream) to bound memory on very large files.
 
 Chunking Strategies:
 - 'part': Chunk by Parts (e.g., Part I, Part II)
@@ -16,29 +17,103 @@ Chunking Strategies:
 
 import json
 import argparse
-import io
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import ModuleType
+from typing import BinaryIO, Dict, Iterator, List, Any, Optional, Tuple, Union
 from lxml import etree
 
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LEG_NS = 'http://www.legislation.gov.uk/namespaces/legislation'
+UKM_NS = 'http://www.legislation.gov.uk/namespaces/metadata'
+
+# Prefix map for legislation.gov.uk XML; kept at module level so the XPath
+# expressions below can use it (a mypyc class body cannot see its own names)
+_NAMESPACES = {
+    'leg': LEG_NS,
+    'ukm': UKM_NS,
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dct': 'http://purl.org/dc/terms/',
+}
+
+# Clark-notation tags, built and interned once instead of per call
+TAG_BODY = sys.intern(f'{{{LEG_NS}}}Body')
+TAG_PART = sys.intern(f'{{{LEG_NS}}}Part')
+TAG_P1GROUP = sys.intern(f'{{{LEG_NS}}}P1group')
+TAG_P1 = sys.intern(f'{{{LEG_NS}}}P1')
+TAG_P2 = sys.intern(f'{{{LEG_NS}}}P2')
+TAG_P3 = sys.intern(f'{{{LEG_NS}}}P3')
+TAG_P4 = sys.intern(f'{{{LEG_NS}}}P4')
+TAG_SCHEDULE = sys.intern(f'{{{LEG_NS}}}Schedule')
+TAG_ADDITION = sys.intern(f'{{{LEG_NS}}}Addition')
+TAG_SUBSTITUTION = sys.intern(f'{{{LEG_NS}}}Substitution')
+TAG_METADATA = sys.intern(f'{{{UKM_NS}}}Metadata')
+
 
 class LegislationParser:
     """Parser for UK legislation XML files with flexible chunking strategies."""
 
     # Namespace for legislation.gov.uk XML
-    NAMESPACES = {
-        'leg': 'http://www.legislation.gov.uk/namespaces/legislation',
-        'ukm': 'http://www.legislation.gov.uk/namespaces/metadata',
-        'dc': 'http://purl.org/dc/elements/1.1/',
-        'dct': 'http://purl.org/dc/terms/',
+    NAMESPACES = _NAMESPACES
+
+    # Precompiled XPath expressions for the per-element lookups; `(...)[1]`
+    # keeps the first-match semantics of element.find()
+    _XP_PNUMBER = etree.XPath('(.//leg:Pnumber)[1]', namespaces=_NAMESPACES)
+    _XP_NUMBER = etree.XPath('(.//leg:Number)[1]', namespaces=_NAMESPACES)
+    _XP_TITLE_BLOCK_TITLE = etree.XPath('(.//leg:TitleBlock/leg:Title)[1]', namespaces=_NAMESPACES)
+    _XP_TITLE = etree.XPath('(.//leg:Title)[1]', namespaces=_NAMESPACES)
+
+    # libxml2 options shared by every iterparse call: skip ID indexing, DTD
+    # loading and entity expansion, and lift the size limits for large files
+    _ITERPARSE_OPTIONS = {
+        'huge_tree': True,
+        'collect_ids': False,
+        'resolve_entities': False,
+        'load_dtd': False,
+        'no_network': True,
     }
 
-    def __init__(self, xml_file: str):
-        """Initialize parser with XML file path."""
+    # XML attribute -> chunk metadata key, in output order
+    _METADATA_ATTRIBUTES = (
+        ('id', 'id'),
+        ('DocumentURI', 'document_uri'),
+        ('IdURI', 'id_uri'),
+        ('RestrictStartDate', 'effective_date'),
+    )
+
+    # Amendment markup tags in Clark notation for element.iterdescendants()
+    _AMENDMENT_TAGS = (TAG_ADDITION, TAG_SUBSTITUTION)
+
+    # Nested sub-section tags collected by _extract_hierarchy()
+    _SUBSECTION_TAGS = (TAG_P2, TAG_P3, TAG_P4)
+
+    def __init__(self, xml_file: str, stream: bool = False,
+                 include_text: bool = True, include_hierarchy: bool = True):
+        """Initialize parser with XML file path.
+
+        By default the file is parsed once and the tree is reused by every
+        strategy; pass stream=True to re-stream the file with iterparse on
+        each call and free elements as they are processed.
+
+        include_text=False skips the full-text walk of each chunk (and of its
+        sub-sections), and include_hierarchy=False skips sub-section
+        extraction, for runs that only need numbers, titles and metadata.
+        """
         self.xml_file = Path(xml_file)
         if not self.xml_file.exists():
             raise FileNotFoundError(f"XML file not found: {xml_file}")
 
+        self.stream = stream
+        self.include_text = include_text
+        self.include_hierarchy = include_hierarchy
+        # ((mtime_ns, size), root) of the parsed file
+        self._tree_cache: Optional[Tuple[Tuple[int, int], etree._Element]] = None
+
         # Check if file starts with non-XML text and needs preprocessing
         self._needs_skip_first_line = False
         with open(self.xml_file, 'r', encoding='utf-8') as f:
@@ -46,92 +121,100 @@ class LegislationParser:
             if first_line and not first_line.startswith('<?xml') and not first_line.startswith('<'):
                 self._needs_skip_first_line = True
 
-    def _get_xml_source(self):
-        """Get XML source, skipping first line if needed."""
+    def _get_xml_source(self) -> BinaryIO:
+        """Open the XML file in binary mode, positioned past the first line if needed."""
+        xml_source = open(self.xml_file, 'rb')
         if self._needs_skip_first_line:
-            # Read file and skip first line
-            with open(self.xml_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()[1:]  # Skip first line
-                xml_content = ''.join(lines)
-                return io.BytesIO(xml_content.encode('utf-8'))
-        else:
-            return str(self.xml_file)
-
-    def _extract_text(self, element) -> str:
+            xml_source.readline()
+        return xml_source
+
+    def _parse_full(self) -> etree._Element:
+        """Return the root of the fully parsed file, reusing it while the file is unchanged."""
+        stat = self.xml_file.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._tree_cache is None or self._tree_cache[0] != key:
+            parser = etree.XMLParser(**self._ITERPARSE_OPTIONS)
+            with self._get_xml_source() as xml_source:
+                root = etree.parse(xml_source, parser).getroot()
+            self._tree_cache = (key, root)
+        return self._tree_cache[1]
+
+    def _iterparse(self, events: Tuple[str, ...], tag: Union[str, Tuple[str, ...]],
+                   force_stream: bool = False) -> Iterator[Tuple[str, etree._Element]]:
+        """Yield (event, element) pairs, from the cached tree unless streaming."""
+        if not (self.stream or force_stream):
+            yield from etree.iterwalk(self._parse_full(), events=events, tag=tag)
+            return
+
+        with self._get_xml_source() as xml_source:
+            yield from etree.iterparse(xml_source, events=events, tag=tag, **self._ITERPARSE_OPTIONS)
+
+    def _release(self, element: etree._Element) -> None:
+        """Free a processed element when streaming; the cached tree is kept intact."""
+        if not self.stream:
+            return
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            # Drop the already-processed earlier siblings with one slice delete
+            del parent[:parent.index(element)]
+
+    def _extract_text(self, element: etree._Element) -> str:
         """Extract all text content from an element, including nested elements."""
-        texts = []
+        # itertext() walks descendant text and tails in document order in C
+        return ' '.join(text.strip() for text in element.itertext() if text.strip())
 
-        # Get text from this element
-        if element.text:
-            texts.append(element.text.strip())
-
-        # Get text from all children recursively
-        for child in element:
-            child_text = self._extract_text(child)
-            if child_text:
-                texts.append(child_text)
-
-            # Get tail text (text after the child element)
-            if child.tail:
-                tail = child.tail.strip()
-                if tail:
-                    texts.append(tail)
-
-        return ' '.join(texts)
-
-    def _extract_metadata(self, element) -> Dict[str, Any]:
+    def _extract_metadata(self, element: etree._Element) -> Dict[str, Any]:
         """Extract common metadata attributes from an element."""
-        metadata = {}
+        metadata: Dict[str, Any] = {}
 
-        # Extract attributes
-        if 'id' in element.attrib:
-            metadata['id'] = element.attrib['id']
-        if 'DocumentURI' in element.attrib:
-            metadata['document_uri'] = element.attrib['DocumentURI']
-        if 'IdURI' in element.attrib:
-            metadata['id_uri'] = element.attrib['IdURI']
-        if 'RestrictStartDate' in element.attrib:
-            metadata['effective_date'] = element.attrib['RestrictStartDate']
+        # Extract attributes; fetch the attrib proxy once and do one lookup per key
+        attrib = element.attrib
+        for attribute, key in self._METADATA_ATTRIBUTES:
+            value = attrib.get(attribute)
+            if value is not None:
+                metadata[key] = value
 
         return metadata
 
-    def _extract_number(self, element) -> Optional[str]:
+    def _extract_number(self, element: etree._Element) -> Optional[str]:
         """Extract number from Pnumber or Number element."""
         # Look for Pnumber child
-        pnumber = element.find('.//leg:Pnumber', self.NAMESPACES)
-        if pnumber is not None and pnumber.text:
-            return pnumber.text.strip()
+        pnumber = self._XP_PNUMBER(element)
+        if pnumber and pnumber[0].text:
+            return pnumber[0].text.strip()
 
         # Look for Number child
-        number = element.find('.//leg:Number', self.NAMESPACES)
-        if number is not None and number.text:
-            return number.text.strip()
+        number = self._XP_NUMBER(element)
+        if number and number[0].text:
+            return number[0].text.strip()
 
         return None
 
-    def _extract_title(self, element) -> Optional[str]:
+    def _extract_title(self, element: etree._Element) -> Optional[str]:
         """Extract title from Title or TitleBlock element."""
         # Try TitleBlock > Title first (for schedules)
-        title_block = element.find('.//leg:TitleBlock/leg:Title', self.NAMESPACES)
-        if title_block is not None:
-            return self._extract_text(title_block)
+        title_block = self._XP_TITLE_BLOCK_TITLE(element)
+        if title_block:
+            return self._extract_text(title_block[0])
 
         # Try direct Title
-        title = element.find('.//leg:Title', self.NAMESPACES)
-        if title is not None:
-            return self._extract_text(title)
+        title = self._XP_TITLE(element)
+        if title:
+            return self._extract_text(title[0])
 
         return None
 
-    def _has_amendments(self, element) -> bool:
+    def _has_amendments(self, element: etree._Element) -> bool:
         """Check if element contains amendment markup (Addition/Substitution)."""
-        additions = element.findall('.//leg:Addition', self.NAMESPACES)
-        substitutions = element.findall('.//leg:Substitution', self.NAMESPACES)
-        return len(additions) > 0 or len(substitutions) > 0
+        # Stop at the first match instead of collecting every amendment
+        for _ in element.iterdescendants(*self._AMENDMENT_TAGS):
+            return True
+        return False
 
-    def _build_chunk(self, element, chunk_type: str) -> Dict[str, Any]:
+    def _build_chunk(self, element: etree._Element, chunk_type: str) -> Dict[str, Any]:
         """Build a standardized chunk dictionary from an element."""
-        chunk = {
+        chunk: Dict[str, Any] = {
             'type': chunk_type,
             'metadata': self._extract_metadata(element),
         }
@@ -147,49 +230,36 @@ class LegislationParser:
             chunk['title'] = title
 
         # Extract text content
-        text = self._extract_text(element)
-        if text:
-            chunk['text'] = text
+        if self.include_text:
+            text = self._extract_text(element)
+            if text:
+                chunk['text'] = text
 
         # Check for amendments
         chunk['has_amendments'] = self._has_amendments(element)
 
         # Extract hierarchy information for nested structures
-        if chunk_type in ['regulation', 'paragraph']:
+        if self.include_hierarchy and chunk_type in ('regulation', 'paragraph'):
             chunk['hierarchy'] = self._extract_hierarchy(element)
 
         return chunk
 
-    def _extract_hierarchy(self, element) -> Dict[str, List[Dict]]:
-        """Extract nested hierarchy (P2, P3, P4 elements)."""
-        hierarchy = {}
-
-        # Find nested P2 elements
-        p2_elements = element.findall('.//leg:P2', self.NAMESPACES)
-        if p2_elements:
-            hierarchy['sub_sections'] = []
-            for p2 in p2_elements:
-                sub = {
-                    'level': 'P2',
-                    'number': self._extract_number(p2),
-                    'text': self._extract_text(p2),
-                    'metadata': self._extract_metadata(p2)
-                }
-                hierarchy['sub_sections'].append(sub)
-
-        # Find nested P3 elements
-        p3_elements = element.findall('.//leg:P3', self.NAMESPACES)
-        if p3_elements:
-            if 'sub_sections' not in hierarchy:
-                hierarchy['sub_sections'] = []
-            for p3 in p3_elements:
-                sub = {
-                    'level': 'P3',
-                    'number': self._extract_number(p3),
-                    'text': self._extract_text(p3),
-                    'metadata': self._extract_metadata(p3)
-                }
-                hierarchy['sub_sections'].append(sub)
+    def _extract_hierarchy(self, element: etree._Element) -> Dict[str, List[Dict]]:
+        """Extract nested hierarchy (P2, P3, P4 elements) in document order."""
+        hierarchy: Dict[str, List[Dict]] = {}
+
+        sub_sections: List[Dict[str, Any]] = []
+        for sub_element in element.iterdescendants(*self._SUBSECTION_TAGS):
+            sub = {
+                'level': sub_element.tag.rsplit('}', 1)[1],
+                'number': self._extract_number(sub_element),
+            }
+            if self.include_text:
+                sub['text'] = self._extract_text(sub_element)
+            sub['metadata'] = self._extract_metadata(sub_element)
+            sub_sections.append(sub)
+        if sub_sections:
+            hierarchy['sub_sections'] = sub_sections
 
         return hierarchy
 
@@ -197,62 +267,33 @@ class LegislationParser:
         """Parse and chunk by Parts (e.g., Part I, Part II)."""
         chunks = []
 
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/legislation}Part')
+        context = self._iterparse(('end',), TAG_PART)
 
         for event, element in context:
             chunk = self._build_chunk(element, 'part')
             chunks.append(chunk)
 
             # Clear element to free memory
-            element.clear()
-            while element.getprevious() is not None:
-                del element.getparent()[0]
+            self._release(element)
 
         return chunks
 
     def parse_by_regulation(self) -> List[Dict[str, Any]]:
         """Parse and chunk by individual Regulations (P1 elements in Body)."""
-        chunks = []
-
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/legislation}P1')
-
-        for event, element in context:
-            # Check if this P1 is in the Body (not in Schedule)
-            parent = element.getparent()
-            while parent is not None:
-                if parent.tag == '{http://www.legislation.gov.uk/namespaces/legislation}Body':
-                    chunk = self._build_chunk(element, 'regulation')
-                    chunks.append(chunk)
-                    break
-                elif parent.tag == '{http://www.legislation.gov.uk/namespaces/legislation}Schedule':
-                    # This P1 is in a schedule, skip it
-                    break
-                parent = parent.getparent()
-
-            # Clear element to free memory
-            element.clear()
-            while element.getprevious() is not None:
-                del element.getparent()[0]
-
-        return chunks
+        return self._parse_p1_in(TAG_BODY, 'regulation')
 
     def parse_by_regulation_group(self) -> List[Dict[str, Any]]:
         """Parse and chunk by regulation groups (P1group elements)."""
         chunks = []
 
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/legislation}P1group')
+        context = self._iterparse(('end',), TAG_P1GROUP)
 
         for event, element in context:
             chunk = self._build_chunk(element, 'regulation_group')
             chunks.append(chunk)
 
             # Clear element to free memory
-            element.clear()
-            while element.getprevious() is not None:
-                del element.getparent()[0]
+            self._release(element)
 
         return chunks
 
@@ -260,64 +301,105 @@ class LegislationParser:
         """Parse and chunk by Schedules."""
         chunks = []
 
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/legislation}Schedule')
+        context = self._iterparse(('end',), TAG_SCHEDULE)
 
         for event, element in context:
             chunk = self._build_chunk(element, 'schedule')
             chunks.append(chunk)
 
             # Clear element to free memory
-            element.clear()
-            while element.getprevious() is not None:
-                del element.getparent()[0]
+            self._release(element)
 
         return chunks
 
     def parse_by_paragraph(self) -> List[Dict[str, Any]]:
         """Parse and chunk by paragraphs within schedules (P1 in schedules)."""
+        return self._parse_p1_in(TAG_SCHEDULE, 'paragraph')
+
+    def _parse_p1_in(self, container_tag: str, chunk_type: str) -> List[Dict[str, Any]]:
+        """Chunk P1 elements whose nearest Body/Schedule ancestor is container_tag."""
         chunks = []
+        containers = []  # Open Body/Schedule ancestors, innermost last
 
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/legislation}P1')
+        context = self._iterparse(('start', 'end'), (TAG_BODY, TAG_SCHEDULE, TAG_P1))
 
         for event, element in context:
-            # Check if this P1 is in a Schedule (not in Body)
-            parent = element.getparent()
-            while parent is not None:
-                if parent.tag == '{http://www.legislation.gov.uk/namespaces/legislation}Schedule':
-                    chunk = self._build_chunk(element, 'paragraph')
-                    chunks.append(chunk)
-                    break
-                elif parent.tag == '{http://www.legislation.gov.uk/namespaces/legislation}Body':
-                    # This P1 is in body, skip it
-                    break
-                parent = parent.getparent()
+            if element.tag != TAG_P1:
+                if event == 'start':
+                    containers.append(element.tag)
+                else:
+                    containers.pop()
+                continue
+            if event == 'start':
+                continue
+
+            if containers and containers[-1] == container_tag:
+                chunk = self._build_chunk(element, chunk_type)
+                chunks.append(chunk)
 
             # Clear element to free memory
-            element.clear()
-            while element.getprevious() is not None:
-                del element.getparent()[0]
+            self._release(element)
 
         return chunks
 
     def parse_all(self) -> Dict[str, List[Dict[str, Any]]]:
         """Parse and extract all chunk types with their hierarchies."""
-        return {
-            'parts': self.parse_by_part(),
-            'regulations': self.parse_by_regulation(),
-            'regulation_groups': self.parse_by_regulation_group(),
-            'schedules': self.parse_by_schedule(),
-            'paragraphs': self.parse_by_paragraph(),
+        return self._parse_multi()
+
+    def _parse_multi(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract every chunk type in a single streaming pass over the file."""
+        results: Dict[str, List[Dict[str, Any]]] = {
+            'parts': [],
+            'regulations': [],
+            'regulation_groups': [],
+            'schedules': [],
+            'paragraphs': [],
         }
+        containers = []  # Open Body/Schedule ancestors, innermost last
+        depth = 0  # Number of open chunk elements
+
+        context = self._iterparse(('start', 'end'), (TAG_BODY, TAG_PART, TAG_P1GROUP, TAG_P1, TAG_SCHEDULE))
+
+        for event, element in context:
+            tag = element.tag
+            if event == 'start':
+                if tag == TAG_BODY or tag == TAG_SCHEDULE:
+                    containers.append(tag)
+                if tag != TAG_BODY:
+                    depth += 1
+                continue
+
+            if tag == TAG_BODY:
+                containers.pop()
+                continue
+
+            depth -= 1
+            if tag == TAG_PART:
+                results['parts'].append(self._build_chunk(element, 'part'))
+            elif tag == TAG_P1GROUP:
+                results['regulation_groups'].append(self._build_chunk(element, 'regulation_group'))
+            elif tag == TAG_SCHEDULE:
+                containers.pop()
+                results['schedules'].append(self._build_chunk(element, 'schedule'))
+            elif containers and containers[-1] == TAG_BODY:
+                results['regulations'].append(self._build_chunk(element, 'regulation'))
+            elif containers:
+                results['paragraphs'].append(self._build_chunk(element, 'paragraph'))
+
+            # Nested chunks are still needed by their enclosing chunk, so only
+            # free memory once the outermost one has been built
+            if depth == 0:
+                self._release(element)
+
+        return results
 
     def get_document_metadata(self) -> Dict[str, Any]:
         """Extract document-level metadata."""
         metadata = {}
 
-        # Parse just the metadata section
-        xml_source = self._get_xml_source()
-        context = etree.iterparse(xml_source, events=('end',), tag='{http://www.legislation.gov.uk/namespaces/metadata}Metadata')
+        # Parse just the metadata section; always stream so reading stops near
+        # the top of the file instead of building the whole tree
+        context = self._iterparse(('end',), TAG_METADATA, force_stream=True)
 
         for event, element in context:
             # Extract title
@@ -357,6 +439,40 @@ class LegislationParser:
         return metadata
 
 
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_json(out: BinaryIO, obj: Any, pretty: bool = False, level: int = 0) -> None:
+    """Write obj as JSON to a binary stream, serializing one chunk at a time.
+
+    Dicts (the 'all' and 'metadata' results) are written key by key and lists
+    item by item, so the full document is never held as a single string.
+    """
+    newline = b'\n' + b'  ' * (level + 1) if pretty else b''
+    closing = b'\n' + b'  ' * level if pretty else b''
+
+    if isinstance(obj, dict) and obj:
+        out.write(b'{')
+        for i, (key, value) in enumerate(obj.items()):
+            out.write((b',' if i else b'') + newline + _dumps(key) + (b': ' if pretty else b':'))
+            write_json(out, value, pretty, level + 1)
+        out.write(closing + b'}')
+    elif isinstance(obj, list) and obj:
+        out.write(b'[')
+        for i, item in enumerate(obj):
+            out.write((b',' if i else b'') + newline)
+            out.write(_dumps(item, pretty).replace(b'\n', newline))
+        out.write(closing + b']')
+    else:
+        out.write(_dumps(obj, pretty))
+
+
 def main():
     """Command-line interface for the legislation parser."""
     parser = argparse.ArgumentParser(
@@ -401,11 +517,31 @@ Examples:
         action='store_true',
         help='Pretty-print JSON output'
     )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream the file with iterparse instead of parsing it into memory once'
+    )
+    parser.add_argument(
+        '--no-text',
+        action='store_true',
+        help='Omit chunk text; output only numbers, titles, metadata and hierarchy'
+    )
+    parser.add_argument(
+        '--no-hierarchy',
+        action='store_true',
+        help='Omit the nested P2/P3/P4 hierarchy of regulations and paragraphs'
+    )
 
     args = parser.parse_args()
 
     # Initialize parser
-    leg_parser = LegislationParser(args.xml_file)
+    leg_parser = LegislationParser(
+        args.xml_file,
+        stream=args.stream,
+        include_text=not args.no_text,
+        include_hierarchy=not args.no_hierarchy,
+    )
 
     # Parse based on strategy
     if args.strategy == 'metadata':
@@ -423,14 +559,10 @@ Examples:
     elif args.strategy == 'all':
         result = leg_parser.parse_all()
 
-    # Format output
-    indent = 2 if args.pretty else None
-    json_output = json.dumps(result, indent=indent, ensure_ascii=False)
-
     # Write output
     if args.output:
-        output_path = Path(args.output)
-        output_path.write_text(json_output, encoding='utf-8')
+        with open(args.output, 'wb') as f:
+            write_json(f, result, args.pretty)
         print(f"Output written to {args.output}")
 
         # Print summary
@@ -444,7 +576,8 @@ Examples:
         else:
             print(f"\nExtracted {len(result)} {args.strategy} chunks")
     else:
-        print(json_output)
+        write_json(sys.stdout.buffer, result, args.pretty)
+        sys.stdout.buffer.write(b'\n')
 
 
 if __name__ == '__main__':
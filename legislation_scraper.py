@@ -1,26 +1,59 @@
 import requests
 import random
 import time
-from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Compiled once; each call runs as XPath inside lxml
+SEL_LEGISLATION_LINKS = CSSSelector("a[href^='/uksi/']")
+SEL_NEXT_LINK = CSSSelector("ul.pagination li.next a")
+SEL_REL_NEXT = CSSSelector("a[rel='next']")
+SEL_PAGE_LINKS = CSSSelector("a[href*='page=']")
 
 class EmploymentLawScraper:
-    def __init__(self, base_url="https://www.legislation.gov.uk/uksi?theme=employment-law"):
+    def __init__(self, base_url="https://www.legislation.gov.uk/uksi?theme=employment-law", timeout=10, max_workers=4):
         self.base_url = base_url
+        self.timeout = timeout
+        self.max_workers = max_workers
         self.xml_urls = []
 
+        # One keep-alive session for every page instead of a new connection per request
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "legislation-parser/1.0",
+        })
+        retries = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+        # Pool one connection per worker so concurrent fetches all keep theirs alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def fetch_page(self, url):
-        """Fetch HTML content for a given page URL."""
-        response = requests.get(url)
+        """Fetch the raw HTML bytes for a given page URL."""
+        response = self.session.get(url, timeout=self.timeout)
         if response.status_code == 200:
-            return response.text
+            # Bytes, not text: lxml rejects decoded strings that carry an
+            # XML encoding declaration, and works out the encoding itself
+            return response.content
         else:
             raise Exception(f"Failed to fetch page: {response.status_code}")
 
-    def extract_xml_urls(self, html):
+    def parse_html(self, html):
+        """Parse page HTML into an lxml document."""
+        # An empty body has no links to find; lxml would raise on it
+        if not html.strip():
+            return lxml_html.Element("html")
+        return lxml_html.document_fromstring(html)
+
+    def extract_xml_urls(self, doc):
         """Extract legislation URLs and append /data.xml."""
-        soup = BeautifulSoup(html, "html.parser")
         links = []
-        for a_tag in soup.select("a[href^='/uksi/']"):
+        for a_tag in SEL_LEGISLATION_LINKS(doc):
             href = a_tag.get("href")
             if href and href.startswith("/uksi/"):
                 # Remove '/contents' if it exists
@@ -30,10 +63,10 @@ class EmploymentLawScraper:
                 links.append(xml_url)
         return links
 
-    def get_next_page(self, soup):
-        next_link = soup.select_one("ul.pagination li.next a") or soup.select_one("a[rel='next']")
-        if next_link:
-            href = next_link.get("href")
+    def get_next_page(self, doc):
+        next_links = SEL_NEXT_LINK(doc) or SEL_REL_NEXT(doc)
+        if next_links:
+            href = next_links[0].get("href")
             # If href is absolute, use it directly
             if href.startswith("http"):
                 return href
@@ -41,19 +74,82 @@ class EmploymentLawScraper:
                 return "https://www.legislation.gov.uk" + href
         return None
 
+    def get_page_numbers(self, doc):
+        """Return the page numbers linked from a listing page's pagination."""
+        numbers = set()
+        for a_tag in SEL_PAGE_LINKS(doc):
+            page = parse_qs(urlparse(a_tag.get("href")).query).get("page")
+            if page and page[0].isdigit():
+                numbers.add(int(page[0]))
+        return numbers
+
+    def get_linked_pages(self, doc, page):
+        """Return {page number: URL} for the listing pages linked from page."""
+        pages = {number: self.page_url(number) for number in self.get_page_numbers(doc)}
+        # Fall back to the next link when it carries no page= query
+        next_page = self.get_next_page(doc)
+        if next_page and page + 1 not in pages:
+            pages[page + 1] = next_page
+        return pages
+
+    def page_url(self, page):
+        """Build the listing URL for a given page number."""
+        parts = urlparse(self.base_url)
+        query = parse_qs(parts.query)
+        query["page"] = [str(page)]
+        return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+    def fetch_listing(self, page, url):
+        """Fetch one listing page and return its XML URLs and linked pages."""
+        time.sleep(random.uniform(0.2, 0.6))  # Jitter to stay polite
+        doc = self.parse_html(self.fetch_page(url))
+        return self.extract_xml_urls(doc), self.get_linked_pages(doc, page)
+
     def run(self):
         """Scrape all pages and collect XML URLs."""
-        current_page = self.base_url
-        while current_page:
-            html = self.fetch_page(current_page)
-            soup = BeautifulSoup(html, "html.parser")
-            page_links = self.extract_xml_urls(html)
-            self.xml_urls.extend(page_links)
-            current_page = self.get_next_page(soup)  # move to next page if exists
-            time.sleep(random.uniform(1, 3))
-
-        # Deduplicate
-        self.xml_urls = list(set(self.xml_urls))
+        doc = self.parse_html(self.fetch_page(self.base_url))
+
+        # Dict keys as an insertion-ordered set: O(1) dedupe and URLs keep
+        # page order. Pages that finish early wait in `pending` only until
+        # every page before them has been added.
+        xml_urls = dict.fromkeys(self.xml_urls)
+        pending = {1: self.extract_xml_urls(doc)}
+        next_page = 1
+
+        def add_ready_pages():
+            nonlocal next_page
+            while next_page in pending:
+                for url in pending.pop(next_page):
+                    xml_urls[url] = None
+                next_page += 1
+
+        add_ready_pages()
+
+        # Fetch every page the pagination links to, a few at a time, queueing
+        # newly discovered pages as each response comes back
+        seen = {1}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def schedule(pages):
+                for page, url in sorted(pages.items()):
+                    if page not in seen:
+                        seen.add(page)
+                        futures[executor.submit(self.fetch_listing, page, url)] = page
+
+            schedule(self.get_linked_pages(doc, 1))
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = futures.pop(future)
+                    pending[page], pages = future.result()
+                    schedule(pages)
+                add_ready_pages()
+
+        # Pages after a gap in the numbering are added last, in page order
+        for page in sorted(pending):
+            for url in pending[page]:
+                xml_urls[url] = None
+        self.xml_urls = list(xml_urls)
         print(f"Found {len(self.xml_urls)} legislation XML URLs.")
         return self.xml_urls
 